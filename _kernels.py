@@ -0,0 +1,152 @@
+"""
+Compiled numerical kernels used by the analysis module.
+
+Numba is optional: when it is not installed ``njit`` becomes a no-op
+decorator and ``NUMBA_AVAILABLE`` is False, so callers can fall back to
+their NumPy implementations. Likewise ``compute_all`` comes from the
+Cython ``risk_kernel`` extension when it has been built, and from NumPy
+otherwise.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback that leaves the decorated function as plain Python"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, parallel=True, fastmath=True)
+def mc_success(
+    returns: np.ndarray,
+    idx: np.ndarray,
+    entry: float,
+    target: float,
+    stop: float
+) -> int:
+    """
+    Number of simulated paths that succeed.
+
+    Row ``i`` of ``idx`` holds the pre-drawn indices into ``returns`` for
+    path ``i``, one per day. A path succeeds if it reaches the target
+    before the stop, or if it touches neither and ends above the entry
+    price. Each path stops compounding as soon as it hits either barrier.
+    """
+    n_sims, horizon = idx.shape
+    hits = np.zeros(n_sims, dtype=np.uint8)
+
+    for i in prange(n_sims):
+        price = entry
+        crossed = False
+        for t in range(horizon):
+            price *= 1.0 + returns[idx[i, t]]
+            if price >= target:
+                hits[i] = 1
+                crossed = True
+                break
+            if price <= stop:
+                crossed = True
+                break
+        if not crossed and price > entry:
+            hits[i] = 1
+
+    return hits.sum()
+
+
+@njit(cache=True)
+def wilder_rsi(close: np.ndarray, length: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index using Wilder's smoothed averages.
+
+    The first ``length`` values are NaN; the averages are seeded with the
+    simple mean of the first ``length`` changes and then updated with
+    Wilder's recurrence.
+    """
+    n = len(close)
+    rsi = np.full(n, np.nan)
+    if n <= length:
+        return rsi
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, length + 1):
+        change = close[i] - close[i - 1]
+        if change > 0:
+            avg_gain += change
+        else:
+            avg_loss -= change
+    avg_gain /= length
+    avg_loss /= length
+
+    for i in range(length, n):
+        if i > length:
+            change = close[i] - close[i - 1]
+            gain = change if change > 0 else 0.0
+            loss = -change if change < 0 else 0.0
+            avg_gain = (avg_gain * (length - 1) + gain) / length
+            avg_loss = (avg_loss * (length - 1) + loss) / length
+
+        if avg_loss == 0:
+            rsi[i] = 100.0
+        else:
+            rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    return rsi
+
+
+if not NUMBA_AVAILABLE:
+    _wilder_rsi_loop = wilder_rsi
+
+    def wilder_rsi(close: np.ndarray, length: int = 14) -> np.ndarray:
+        """
+        Interpreted fallback for ``wilder_rsi``.
+
+        Runs the same recurrence over a list of Python floats, which avoids
+        boxing a NumPy scalar on every element access.
+        """
+        return _wilder_rsi_loop(np.asarray(close, dtype=np.float64).tolist(), length)
+
+
+def _compute_all_numpy(closes: np.ndarray, rsi_len: int = 14) -> tuple:
+    """
+    NumPy fallback for ``risk_kernel.compute_all``.
+
+    Returns:
+        Tuple of (volatility, bearish_freq, current, avg_ret, std_ret)
+    """
+    returns = np.diff(closes) / closes[:-1]
+    std_ret = returns.std(ddof=1)
+
+    rsi = wilder_rsi(closes, rsi_len)
+    rsi = rsi[~np.isnan(rsi)]
+    bearish_freq = (rsi < 30).mean() if rsi.size else 0.0
+
+    return (
+        float(std_ret * np.sqrt(252)),
+        float(bearish_freq),
+        float(closes[-1]),
+        float(returns.mean()),
+        float(std_ret)
+    )
+
+
+try:
+    from risk_kernel import compute_all
+    RISK_KERNEL_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    RISK_KERNEL_AVAILABLE = False
+    compute_all = _compute_all_numpy
+
+
+def limit_kernel_threads(n: int) -> None:
+    """Cap the number of threads parallel Numba kernels use in this process"""
+    if NUMBA_AVAILABLE:
+        from numba import set_num_threads
+        set_num_threads(n)
@@ -1,156 +1,323 @@
-from typing import Dict, Any, Optional
-import pandas as pd
-import matplotlib.pyplot as plt
+from typing import Dict, Any, Optional, Tuple
+from functools import lru_cache, wraps
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+from itertools import repeat
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+import threading
+import copy
+import matplotlib
 import numpy as np
 import os
 from dotenv import load_dotenv
 from io import BytesIO
 import base64
+from _kernels import NUMBA_AVAILABLE, compute_all, limit_kernel_threads, mc_success
+
+try:
+    import cupy as cp
+    CUPY_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    cp = None
+    CUPY_AVAILABLE = False
+
+matplotlib.use('Agg')
+from matplotlib.figure import Figure  # noqa: E402
 
 # Load environment variables
 load_dotenv()
 
-
-def analyse_risk(stock_data: Dict[str, Any], target_selling_price: float, stop_loss: float, user_volume: float) -> Dict[str, Any]:
+# Radar plots are drawn on one reusable figure, guarded for worker threads
+_RADAR_FIGURE = Figure(figsize=(10, 6))
+_RADAR_LOCK = threading.Lock()
+
+# Radar axes are fixed, so their angles are computed once
+_RADAR_CATEGORIES = ('Volatility', 'Drawdown', 'Liquidity', 'Bearishness')
+_RADAR_ANGLES = np.linspace(0, 2*np.pi, len(_RADAR_CATEGORIES), endpoint=False)
+# Repeat first angle to close the circle
+_RADAR_ANGLES_CLOSED = np.concatenate([_RADAR_ANGLES, _RADAR_ANGLES[:1]])
+
+# Normalization caps for volatility (50% annual), drawdown (30%),
+# liquidity (70% below avg) and bearish frequency (30%)
+_RISK_CAPS = np.array([0.5, 0.3, 0.7, 0.3])
+# Overall risk above these bounds is MEDIUM and HIGH respectively
+_RISK_LEVEL_THRESHOLDS = np.array([0.4, 0.7])
+_RISK_LEVELS = ('LOW', 'MEDIUM', 'HIGH')
+
+# Simulation counts from which the Monte Carlo is spread over processes
+PARALLEL_MIN_SIMULATIONS = 100_000
+# Shared process pool for parallel Monte Carlo, created on first use
+_MC_POOL: Optional[ProcessPoolExecutor] = None
+_MC_POOL_LOCK = threading.Lock()
+_MC_POOL_WORKERS = min(os.cpu_count() or 1, 4)
+# Size of the float32 path matrix from which the Monte Carlo runs on the GPU
+GPU_MIN_PATH_BYTES = 4 * 1024 * 1024
+
+
+def _parse_series(time_series: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Analyse risk for a given stock based on target selling price, stop loss, and user's buying volume.
+    Parse an Alpha Vantage daily time series into chronological arrays.
 
-    Args:
-        stock_data: Stock data from Alpha Vantage API
-        target_selling_price: Target price to sell the stock
-        stop_loss: Stop loss price to limit losses
-        user_volume: Number of shares the user is buying (affects liquidity risk)
+    Only the close and volume columns are read; both are stored as float32.
 
     Returns:
-        Dictionary containing risk analysis results and plot
+        Tuple of (closes, volumes)
     """
-    try:
-        # Extract time series data
-        time_series = stock_data.get("Time Series (Daily)", {})
-        if not time_series:
-            return {"error": "No time series data available"}
+    # ISO YYYY-MM-DD keys sort lexicographically in chronological order
+    dates = sorted(time_series)
+    n = len(dates)
+    closes = np.empty(n, dtype=np.float32)
+    volumes = np.empty(n, dtype=np.float32)
+    for i, date in enumerate(dates):
+        row = time_series[date]
+        closes[i] = float(row['4. close'])
+        volumes[i] = float(row['5. volume'])
 
-        # Convert to DataFrame
-        df = pd.DataFrame.from_dict(time_series, orient='index')
-        df.index = pd.to_datetime(df.index)
-        df = df.sort_index(ascending=True)  # Ensure chronological order
+    return closes, volumes
 
-        # Get latest price and convert columns to float
-        current_price = float(df['4. close'].iloc[-1])
-        closes = df['4. close'].astype(float)
-        volumes = df['5. volume'].astype(float)
 
-        # Calculate daily returns
-        daily_returns = closes.pct_change().dropna()
+def _cached_analysis(func):
+    """
+    Memoize an analysis of Alpha Vantage stock data for 60 seconds.
 
-        # 1. Volatility Risk (Annualized)
-        volatility = daily_returns.std() * np.sqrt(252)
-        norm_volatility = min(volatility / 0.5, 1.0)  # Cap at 50% annual vol
+    The symbol and last refresh time stand in for the data itself, so a
+    refreshed series naturally misses the cache; data lacking either is
+    never cached. Callers get a copy, so mutating a result cannot leak
+    into later calls.
+    """
+    cache = TTLCache(maxsize=1024, ttl=60)
+    lock = threading.Lock()
 
-        # 2. Drawdown Risk
-        drawdown = (current_price - stop_loss) / current_price
-        norm_drawdown = min(drawdown / 0.3, 1.0)  # Cap at 30% drawdown
+    @wraps(func)
+    def wrapper(stock_data: Dict[str, Any], *args, **kwargs) -> Dict[str, Any]:
+        meta = stock_data.get("Meta Data", {})
+        symbol = meta.get("2. Symbol")
+        last_refreshed = meta.get("3. Last Refreshed")
+        if symbol is None or last_refreshed is None:
+            return func(stock_data, *args, **kwargs)
 
-        # 3. Liquidity Risk (Volume vs Historical + User Volume Impact)
-        avg_volume = volumes.mean()
-        recent_volume = volumes[-20:].mean()
+        key = hashkey(symbol, last_refreshed, *args, **kwargs)
+        with lock:
+            result = cache.get(key)
+        if result is None:
+            result = func(stock_data, *args, **kwargs)
+            with lock:
+                cache[key] = result
 
-        # Calculate base liquidity risk
-        liquidity_risk = 1 - (recent_volume / avg_volume)
+        return copy.deepcopy(result)
 
-        # Adjust for user volume if provided
-        if user_volume is not None:
-            # Calculate what percentage of recent volume the user's order represents
-            user_volume_pct = user_volume / recent_volume
-            # Increase liquidity risk if user's volume is significant (>5% of recent volume)
-            if user_volume_pct > 0.05:
-                # Scale risk up proportionally
-                liquidity_risk *= (1 + user_volume_pct)
+    return wrapper
 
-        norm_liquidity = min(liquidity_risk / 0.7, 1.0)  # Cap at 70% below avg
 
-        # 4. Bearish Pressure (RSI < 30 frequency)
-        delta = closes.diff()
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
+def _daily_returns(closes: np.ndarray) -> np.ndarray:
+    """Simple day-over-day returns of a chronological close series"""
+    return np.diff(closes) / closes[:-1]
 
-        # Calculate average gains and losses
-        avg_gain = gain.rolling(window=14, min_periods=1).mean()
-        avg_loss = loss.rolling(window=14, min_periods=1).mean()
 
-        # Calculate RS and RSI (with NaN handling)
-        avg_loss_safe = np.where(avg_loss == 0, np.nan, avg_loss)
-        rs = avg_gain / avg_loss_safe
-        rsi = 100 - (100 / (1 + rs))
+def _compute_risk(
+    closes: np.ndarray,
+    volumes: np.ndarray,
+    target_selling_price: float,
+    stop_loss: float,
+    user_volume: float
+) -> Dict[str, Any]:
+    """
+    Compute the risk metrics from chronological close and volume arrays.
 
-        # Calculate bearish frequency safely
-        if isinstance(rsi, pd.Series):
-            bearish_freq = (rsi < 30).mean()
-        else:
-            bearish_freq = 0.0
+    Prices are processed in float32, which is ample for daily closes.
 
-        norm_bearish = min(bearish_freq / 0.3, 1.0)  # Cap at 30% frequency
+    Returns:
+        Dictionary containing risk analysis results and normalized risk components
+    """
+    closes = np.ascontiguousarray(closes, dtype=np.float32)
+    volumes = np.asarray(volumes, dtype=np.float32)
+
+    # 1. Volatility Risk (Annualized) and 4. Bearish Pressure (RSI < 30
+    # frequency, Wilder's smoothing), fused into one pass over the closes
+    volatility, bearish_freq, current_price, _, _ = compute_all(closes, 14)
+
+    # 2. Drawdown Risk
+    drawdown = (current_price - stop_loss) / current_price
+
+    # 3. Liquidity Risk (Volume vs Historical + User Volume Impact)
+    avg_volume = volumes.mean(dtype=np.float64)
+    recent_volume = float(volumes[-20:].mean(dtype=np.float64))
+
+    # Calculate base liquidity risk
+    liquidity_risk = 1 - (recent_volume / avg_volume)
+
+    # Adjust for user volume if provided
+    if user_volume is not None:
+        # Calculate what percentage of recent volume the user's order represents
+        user_volume_pct = user_volume / recent_volume
+        # Increase liquidity risk if user's volume is significant (>5% of recent volume)
+        if user_volume_pct > 0.05:
+            # Scale risk up proportionally
+            liquidity_risk *= (1 + user_volume_pct)
+
+    # Normalize each component against its cap and score the overall risk
+    raw = np.array([volatility, drawdown, liquidity_risk, bearish_freq])
+    norms = np.minimum(raw / _RISK_CAPS, 1.0)
+    overall = norms.mean()
+    # searchsorted sorts NaN (too few closes) last; it exceeds no threshold
+    if np.isnan(overall):
+        risk_level = _RISK_LEVELS[0]
+    else:
+        risk_level = _RISK_LEVELS[np.searchsorted(_RISK_LEVEL_THRESHOLDS, overall)]
+    norm_volatility, norm_drawdown, norm_liquidity, norm_bearish = norms
 
-        # Create radar plot
-        fig = plt.figure(figsize=(10, 6))
+    return {
+        "current_price": current_price,
+        "target_selling_price": target_selling_price,
+        "stop_loss": stop_loss,
+        "user_volume": user_volume,
+        "recent_avg_volume": recent_volume,
+        "volume_impact": user_volume/recent_volume if user_volume else None,
+        "risk_analysis": {
+            "volatility": float(volatility),
+            "drawdown_risk": float(drawdown),
+            "liquidity_risk": float(liquidity_risk),
+            "bearish_frequency": float(bearish_freq),
+            "risk_level": risk_level
+        },
+        "normalized_risk": {
+            "volatility": float(norm_volatility),
+            "drawdown": float(norm_drawdown),
+            "liquidity": float(norm_liquidity),
+            "bearishness": float(norm_bearish)
+        }
+    }
+
+
+def _analyse_series(
+    stock_data: Dict[str, Any],
+    target_selling_price: float,
+    stop_loss: float,
+    user_volume: float
+) -> Tuple[Dict[str, Any], Optional[np.ndarray]]:
+    """
+    Parse Alpha Vantage stock data and compute its risk metrics.
 
-        categories = ['Volatility', 'Drawdown', 'Liquidity', 'Bearishness']
-        values = [norm_volatility, norm_drawdown, norm_liquidity, norm_bearish]
+    Returns:
+        Tuple of (risk result, closes); the result holds an "error" key and
+        closes is None when the data cannot be analysed
+    """
+    try:
+        # Extract time series data
+        time_series = stock_data.get("Time Series (Daily)", {})
+        if not time_series:
+            return {"error": "No time series data available"}, None
 
-        # Repeat first value to close the circle
-        values += values[:1]
-        angles = np.linspace(0, 2*np.pi, len(categories),
-                             endpoint=False).tolist()
-        angles += angles[:1]
+        closes, volumes = _parse_series(time_series)
+
+        return {
+            "symbol": stock_data.get("Meta Data", {}).get("2. Symbol", "Unknown"),
+            **_compute_risk(closes, volumes, target_selling_price, stop_loss, user_volume)
+        }, closes
+
+    except Exception as e:
+        print(f"Error in risk analysis: {str(e)}")
+        return {"error": f"Error in risk analysis: {str(e)}"}, None
+
+
+@_cached_analysis
+def analyse_risk(stock_data: Dict[str, Any], target_selling_price: float, stop_loss: float, user_volume: float) -> Dict[str, Any]:
+    """
+    Analyse risk for a given stock based on target selling price, stop loss, and user's buying volume.
+
+    Args:
+        stock_data: Stock data from Alpha Vantage API
+        target_selling_price: Target price to sell the stock
+        stop_loss: Stop loss price to limit losses
+        user_volume: Number of shares the user is buying (affects liquidity risk)
+
+    Returns:
+        Dictionary containing risk analysis results and normalized risk components
+    """
+    risk_result, _ = _analyse_series(
+        stock_data, target_selling_price, stop_loss, user_volume)
+    return risk_result
+
+
+@lru_cache(maxsize=512)
+def _render_radar(
+    symbol: str,
+    current_price: float,
+    target_price: float,
+    stop_loss: float,
+    user_volume: Optional[float],
+    recent_volume: float,
+    norm_vals: Tuple[float, ...]
+) -> str:
+    """Draw the risk radar chart and return it as a base64 PNG"""
+    # Repeat first value to close the circle
+    values = np.array(norm_vals + norm_vals[:1])
+
+    with _RADAR_LOCK:
+        fig = _RADAR_FIGURE
+        fig.clear()
 
         ax = fig.add_subplot(111, polar=True)
-        ax.plot(angles, values, linewidth=2,
+        ax.plot(_RADAR_ANGLES_CLOSED, values, linewidth=2,
                 linestyle='solid', label='Risk Components')
-        ax.fill(angles, values, alpha=0.25)
+        ax.fill(_RADAR_ANGLES_CLOSED, values, alpha=0.25)
 
         # Draw axis lines
-        ax.set_xticks(angles[:-1])
-        ax.set_xticklabels(categories)
+        ax.set_xticks(_RADAR_ANGLES)
+        ax.set_xticklabels(_RADAR_CATEGORIES)
         ax.set_yticks([0.25, 0.5, 0.75, 1.0])
         ax.set_yticklabels(['25%', '50%', '75%', '100%'])
 
         # Title and annotations
-        symbol = stock_data.get("Meta Data", {}).get("2. Symbol", "Unknown")
-        title = f'Risk Profile for {symbol}\nCurrent: ${current_price:.2f} | Target: ${target_selling_price:.2f} | Stop: ${stop_loss:.2f}'
+        title = f'Risk Profile for {symbol}\nCurrent: ${current_price:.2f} | Target: ${target_price:.2f} | Stop: ${stop_loss:.2f}'
         if user_volume:
             title += f'\nUser Volume: {user_volume:,} shares ({user_volume/recent_volume:.1%} of recent volume)'
-        plt.title(title, pad=20)
+        ax.set_title(title, pad=20)
 
         # Save to base64
         buffer = BytesIO()
-        plt.savefig(buffer, format='png', bbox_inches='tight')
-        plt.close()
-        buffer.seek(0)
-        img_base64 = base64.b64encode(buffer.read()).decode('utf-8')
+        fig.savefig(buffer, format='png', bbox_inches='tight')
 
-        return {
-            "symbol": symbol,
-            "current_price": current_price,
-            "target_selling_price": target_selling_price,
-            "stop_loss": stop_loss,
-            "user_volume": user_volume,
-            "recent_avg_volume": recent_volume,
-            "volume_impact": user_volume/recent_volume if user_volume else None,
-            "risk_analysis": {
-                "volatility": float(volatility),
-                "drawdown_risk": float(drawdown),
-                "liquidity_risk": float(liquidity_risk),
-                "bearish_frequency": float(bearish_freq),
-                "risk_level": "HIGH" if (norm_volatility + norm_drawdown + norm_liquidity + norm_bearish) / 4 > 0.7
-                              else "MEDIUM" if (norm_volatility + norm_drawdown + norm_liquidity + norm_bearish) / 4 > 0.4
-                              else "LOW"
-            },
-            "plot": img_base64
-        }
+    return base64.b64encode(buffer.getvalue()).decode('utf-8')
 
-    except Exception as e:
-        print(f"Error in risk analysis: {str(e)}")
-        return {"error": f"Error in risk analysis: {str(e)}"}
+
+def render_radar(
+    symbol: str,
+    current_price: float,
+    target_price: float,
+    stop_loss: float,
+    user_volume: Optional[float],
+    recent_volume: float,
+    norm_vals: Tuple[float, ...]
+) -> str:
+    """
+    Render the risk profile radar chart for a stock.
+
+    Inputs are rounded so near-identical risk profiles reuse a cached image.
+
+    Args:
+        symbol: Stock symbol
+        current_price: Latest closing price
+        target_price: Target selling price
+        stop_loss: Stop loss price
+        user_volume: Number of shares the user is buying
+        recent_volume: Recent average daily volume
+        norm_vals: Normalized volatility, drawdown, liquidity and bearishness
+
+    Returns:
+        Base64-encoded PNG image
+    """
+    return _render_radar(
+        symbol,
+        round(current_price, 3),
+        round(target_price, 3),
+        round(stop_loss, 3),
+        round(user_volume, 3) if user_volume else user_volume,
+        round(recent_volume, 3),
+        tuple(round(float(v), 3) for v in norm_vals)
+    )
 
 
 def get_rating(sharpe: float, rr_ratio: float) -> str:
@@ -165,13 +332,210 @@ def get_rating(sharpe: float, rr_ratio: float) -> str:
         return "⭐️⭐️ WEAK"
 
 
+def _count_successes(
+    price_paths: Any,
+    entry_price: float,
+    target_price: float,
+    stop_loss: float
+) -> int:
+    """Count successful rows of a NumPy or CuPy (n_paths, n_days) price matrix"""
+    n_days = price_paths.shape[1]
+
+    # Day each barrier is first touched, n_days if never
+    above = price_paths >= target_price
+    first_target = above.argmax(axis=1)
+    first_target[~above.any(axis=1)] = n_days
+    below = price_paths <= stop_loss
+    first_stop = below.argmax(axis=1)
+    first_stop[~below.any(axis=1)] = n_days
+
+    hit_target = (first_target < n_days) & (first_target <= first_stop)
+    untouched = (first_target == n_days) & (first_stop == n_days)
+    # Count as success if above entry price at end
+    end_up = untouched & (price_paths[:, -1] > entry_price)
+
+    return int(hit_target.sum() + end_up.sum())
+
+
+def _mc_chunk(
+    returns: np.ndarray,
+    entry_price: float,
+    target_price: float,
+    stop_loss: float,
+    n_simulations: int,
+    seed: np.random.SeedSequence
+) -> int:
+    """Count successful 30-day paths among n_simulations drawn from seed"""
+    rng = np.random.default_rng(seed)
+
+    # Draw the resampling indices of every 30-day path in one call
+    idx = rng.integers(0, returns.size, size=(n_simulations, 30), dtype=np.int32)
+
+    if NUMBA_AVAILABLE:
+        # Fused compound/check kernel, parallel across simulations
+        return int(mc_success(
+            returns, idx, entry_price, target_price, stop_loss))
+
+    # Generate every random walk at once from historical returns
+    price_paths = entry_price * np.cumprod(1.0 + returns[idx], axis=1)
+
+    return _count_successes(price_paths, entry_price, target_price, stop_loss)
+
+
+def _mc_chunk_gpu(
+    returns: np.ndarray,
+    entry_price: float,
+    target_price: float,
+    stop_loss: float,
+    n_simulations: int,
+    seed: np.random.SeedSequence
+) -> int:
+    """Count successful 30-day paths among n_simulations simulated with CuPy"""
+    rng = cp.random.default_rng(int(seed.generate_state(1)[0]))
+    returns_gpu = cp.asarray(returns, dtype=cp.float32)
+
+    idx = rng.integers(0, returns_gpu.size, size=(n_simulations, 30), dtype=cp.int32)
+    price_paths = entry_price * cp.cumprod(1.0 + returns_gpu[idx], axis=1)
+
+    return _count_successes(price_paths, entry_price, target_price, stop_loss)
+
+
+def _init_mc_worker() -> None:
+    """Run Numba kernels single-threaded in pool workers to avoid oversubscription"""
+    limit_kernel_threads(1)
+
+
+def _mc_pool() -> ProcessPoolExecutor:
+    """
+    Return the shared Monte Carlo process pool.
+
+    Workers are spawned rather than forked: forking a parent that has
+    already started Numba's threading layer breaks or hangs the workers.
+    """
+    global _MC_POOL
+    with _MC_POOL_LOCK:
+        if _MC_POOL is None:
+            _MC_POOL = ProcessPoolExecutor(
+                max_workers=_MC_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_mc_worker)
+        return _MC_POOL
+
+
+def _discard_mc_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken Monte Carlo pool so the next call builds a fresh one"""
+    global _MC_POOL
+    with _MC_POOL_LOCK:
+        if _MC_POOL is pool:
+            _MC_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def estimate_success_probability_parallel(
+    returns: np.ndarray,
+    entry_price: float,
+    target_price: float,
+    stop_loss: float,
+    n_simulations: int,
+    n_workers: Optional[int] = None,
+    seed: Optional[int] = None
+) -> float:
+    """
+    Monte Carlo success probability split across worker processes.
+
+    Each worker simulates its share of paths with its own child of the
+    seed's SeedSequence, so the streams never overlap and the result is
+    reproducible for a given seed and worker count.
+
+    Args:
+        returns: Historical daily returns to resample
+        entry_price: Entry price of the trade
+        target_price: Target selling price
+        stop_loss: Stop loss price
+        n_simulations: Total number of simulated paths
+        n_workers: Number of chunks, each with its own random stream
+            (default: CPU count, at most 4)
+        seed: Optional seed for a reproducible simulation
+    """
+    if n_simulations < 1:
+        raise ValueError(f"n_simulations must be at least 1, got {n_simulations}")
+
+    if len(returns) < 5:
+        return 0.5  # Default if insufficient data
+
+    if n_workers is None:
+        n_workers = _MC_POOL_WORKERS
+    if n_workers < 1:
+        raise ValueError(f"n_workers must be at least 1, got {n_workers}")
+
+    returns = np.ascontiguousarray(returns, dtype=np.float32)
+    child_seeds = np.random.SeedSequence(seed).spawn(n_workers)
+    chunks = [n_simulations // n_workers + (i < n_simulations % n_workers)
+              for i in range(n_workers)]
+
+    pool = _mc_pool()
+    try:
+        hits = sum(pool.map(
+            _mc_chunk, repeat(returns), repeat(entry_price),
+            repeat(target_price), repeat(stop_loss), chunks, child_seeds))
+    except BrokenProcessPool:
+        # A worker died; replace the pool for later calls and finish this
+        # one in-process with the same seeds, so the result is unchanged
+        _discard_mc_pool(pool)
+        hits = sum(
+            _mc_chunk(returns, entry_price, target_price, stop_loss, chunk, child_seed)
+            for chunk, child_seed in zip(chunks, child_seeds))
+
+    return hits / n_simulations
+
+
+def estimate_success_probability_arr(
+    returns: np.ndarray,
+    entry_price: float,
+    target_price: float,
+    stop_loss: float,
+    n_simulations: int = 1000,
+    seed: Optional[int] = None
+) -> float:
+    """
+    Estimate probability of hitting target before stop loss
+    using Monte Carlo simulation over an array of historical daily returns.
+
+    Passing a seed makes the simulation reproducible; each call owns its
+    own PCG64 generator, so concurrent requests never share RNG state.
+    Large simulation counts run on the GPU when CuPy is installed, and are
+    otherwise spread over worker processes.
+    """
+    if n_simulations < 1:
+        raise ValueError(f"n_simulations must be at least 1, got {n_simulations}")
+
+    if len(returns) < 5:
+        return 0.5  # Default if insufficient data
+
+    if CUPY_AVAILABLE and n_simulations * 30 * 4 > GPU_MIN_PATH_BYTES:
+        hits = _mc_chunk_gpu(returns, entry_price, target_price, stop_loss,
+                             n_simulations, np.random.SeedSequence(seed))
+        return hits / n_simulations
+
+    if n_simulations >= PARALLEL_MIN_SIMULATIONS:
+        return estimate_success_probability_parallel(
+            returns, entry_price, target_price, stop_loss, n_simulations, seed=seed)
+
+    returns = np.ascontiguousarray(returns, dtype=np.float32)
+    hits = _mc_chunk(returns, entry_price, target_price, stop_loss,
+                     n_simulations, np.random.SeedSequence(seed))
+
+    return hits / n_simulations
+
+
 def estimate_success_probability(
     stock_data: Dict[str, Any],
     entry_price: float,
     target_price: float,
     stop_loss: float,
     n_simulations: int = 1000,
-    lookback_days: int = 60
+    lookback_days: int = 60,
+    seed: Optional[int] = None
 ) -> float:
     """
     Estimate probability of hitting target before stop loss
@@ -182,41 +546,23 @@ def estimate_success_probability(
     if not time_series:
         return 0.5  # Default if insufficient data
 
-    # Convert to DataFrame and extract closing prices
-    df = pd.DataFrame.from_dict(time_series, orient='index')
-    closes = df['4. close'].astype(float).sort_index(ascending=True)
-
-    recent_returns = closes.pct_change().dropna()[-lookback_days:]
-
-    if len(recent_returns) < 5:
-        return 0.5  # Default if insufficient data
+    closes, _ = _parse_series(time_series)
+    recent_returns = _daily_returns(closes)[-lookback_days:]
 
-    hits_target = 0
-
-    for _ in range(n_simulations):
-        # Generate random walk using historical returns
-        random_returns = np.random.choice(
-            recent_returns, size=30)  # 30-day simulation
-        price_path = entry_price * (1 + random_returns).cumprod()
-
-        if price_path.max() >= target_price:
-            hits_target += 1
-        elif price_path.min() <= stop_loss:
-            continue
-        else:
-            # Count as success if above entry price at end
-            hits_target += 1 if price_path[-1] > entry_price else 0
-
-    return hits_target / n_simulations
+    return estimate_success_probability_arr(
+        recent_returns, entry_price, target_price, stop_loss, n_simulations, seed)
 
 
+@_cached_analysis
 def calculate_risk_reward(
     stock_data: Dict[str, Any],
     target_price: float,
     stop_loss: float,
     user_volume: float,
     holding_period_days: int = 30,
-    risk_free_rate: float = 0.04  # Fallback: 4%
+    risk_free_rate: float = 0.04,  # Fallback: 4%
+    n_simulations: int = 1000,
+    seed: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Comprehensive risk/reward analysis combining both metrics.
@@ -228,12 +574,14 @@ def calculate_risk_reward(
         user_volume: Number of shares
         holding_period_days: Investment horizon
         risk_free_rate: Annual risk-free rate
+        n_simulations: Number of Monte Carlo paths for the success probability
+        seed: Optional seed for a reproducible success probability simulation
 
     Returns:
         Combined analysis with Sharpe and Risk/Reward ratios
     """
-    # Calculate risk metrics
-    risk_result = analyse_risk(
+    # Parse once and share the closes between the risk and reward metrics
+    risk_result, closes = _analyse_series(
         stock_data, target_price, stop_loss, user_volume)
     if "error" in risk_result:
         return risk_result
@@ -250,11 +598,13 @@ def calculate_risk_reward(
     sharpe_ratio = (annualized_return - risk_free_rate) / volatility
 
     # Risk/Reward Ratio (probability-adjusted)
-    success_prob = estimate_success_probability(
-        stock_data,
+    success_prob = estimate_success_probability_arr(
+        _daily_returns(closes)[-60:],  # 60-day lookback
         current_price,
         target_price,
-        stop_loss
+        stop_loss,
+        n_simulations,
+        seed=seed
     )
     risk_reward_ratio = (success_prob * potential_return_pct) / (
         (1 - success_prob) * abs((stop_loss / current_price - 1))
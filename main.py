@@ -1,19 +1,34 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
+from contextlib import asynccontextmanager
+import asyncio
+import json
 import os
-import requests
+import httpx
+from cachetools import TTLCache
 from dotenv import load_dotenv
-from typing import Optional
-from analysis import analyse_risk, calculate_risk_reward
+from typing import Optional, Dict, Any, Literal
+from analysis import analyse_risk, calculate_risk_reward, render_radar
 
 # Load environment variables
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open a shared async HTTP client for the lifetime of the app"""
+    app.state.http = httpx.AsyncClient(
+        timeout=5.0, limits=httpx.Limits(max_connections=50))
+    yield
+    await app.state.http.aclose()
+
+
 app = FastAPI(
     title="Stock Market Analyzer",
     description="A FastAPI server for analyzing stock market data using Alpha Vantage API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -29,6 +44,94 @@ app.add_middleware(
 ALPHA_VANTAGE_API_KEY = os.getenv("ALPHA_VANTAGE_API_KEY")
 ALPHA_VANTAGE_BASE_URL = "https://www.alphavantage.co/query"
 
+# Upper bound on Monte Carlo paths per request, to keep memory bounded
+MAX_SIMULATIONS = 1_000_000
+
+# Recent Alpha Vantage responses keyed by (function, symbol)
+CACHE = TTLCache(maxsize=256, ttl=60)
+
+
+async def _fetch(http: httpx.AsyncClient, function: str, symbol: str) -> Dict[str, Any]:
+    """
+    Fetch data from Alpha Vantage, serving repeated requests from the cache
+
+    Args:
+        http: Shared async HTTP client
+        function: Alpha Vantage function (e.g., TIME_SERIES_DAILY)
+        symbol: Stock symbol (e.g., AAPL, MSFT)
+    """
+    key = (function, symbol.upper())
+    if key in CACHE:
+        return CACHE[key]
+
+    params = {
+        "function": function,
+        "symbol": symbol.upper(),
+        "apikey": ALPHA_VANTAGE_API_KEY
+    }
+
+    response = await http.get(ALPHA_VANTAGE_BASE_URL, params=params)
+    response.raise_for_status()
+
+    # httpx raises a plain JSONDecodeError (a ValueError) on non-JSON bodies
+    try:
+        data = response.json()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error fetching data: {str(e)}")
+
+    # Check for API errors
+    if "Error Message" in data:
+        raise HTTPException(status_code=400, detail=data["Error Message"])
+
+    if "Note" in data:
+        raise HTTPException(
+            status_code=429, detail="API rate limit exceeded")
+
+    CACHE[key] = data
+    return data
+
+
+async def _render_plot(result: Dict[str, Any]) -> str:
+    """Render the radar chart for an analysis result in a worker thread"""
+    return await asyncio.to_thread(
+        render_radar,
+        result["symbol"],
+        result["current_price"],
+        result["target_selling_price"],
+        result["stop_loss"],
+        result["user_volume"],
+        result["recent_avg_volume"],
+        tuple(result["normalized_risk"].values())
+    )
+
+
+async def _plot_html(result: Dict[str, Any], format: Literal["html", "png"]) -> str:
+    """
+    Build the radar chart markup for an analysis result
+
+    Args:
+        result: Risk analysis result containing normalized risk components
+        format: "png" for a server-rendered image, "html" for a client-side Chart.js radar
+    """
+    if format == "png":
+        plot = await _render_plot(result)
+        return f'<img src="data:image/png;base64,{plot}" alt="Risk Profile Chart">'
+
+    norm = result["normalized_risk"]
+    return f"""<canvas id="radar"></canvas>
+                    <script src="https://cdn.jsdelivr.net/npm/chart.js@4"></script>
+                    <script>
+                        new Chart(document.getElementById('radar'), {{
+                            type: 'radar',
+                            data: {{
+                                labels: {json.dumps([name.capitalize() for name in norm])},
+                                datasets: [{{ label: 'Risk Components', data: {json.dumps(list(norm.values()))}, fill: true }}]
+                            }},
+                            options: {{ scales: {{ r: {{ suggestedMin: 0, suggestedMax: 1 }} }} }}
+                        }});
+                    </script>"""
+
 
 @app.get("/")
 async def root():
@@ -62,28 +165,9 @@ async def get_stock_data(symbol: str, function: str = "TIME_SERIES_DAILY"):
         )
 
     try:
-        params = {
-            "function": function,
-            "symbol": symbol.upper(),
-            "apikey": ALPHA_VANTAGE_API_KEY
-        }
-
-        response = requests.get(ALPHA_VANTAGE_BASE_URL, params=params)
-        response.raise_for_status()
-
-        data = response.json()
+        return await _fetch(app.state.http, function, symbol)
 
-        # Check for API errors
-        if "Error Message" in data:
-            raise HTTPException(status_code=400, detail=data["Error Message"])
-
-        if "Note" in data:
-            raise HTTPException(
-                status_code=429, detail="API rate limit exceeded")
-
-        return data
-
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(
             status_code=500, detail=f"Error fetching data: {str(e)}")
 
@@ -109,10 +193,15 @@ async def search_stocks(keywords: str):
             "apikey": ALPHA_VANTAGE_API_KEY
         }
 
-        response = requests.get(ALPHA_VANTAGE_BASE_URL, params=params)
+        response = await app.state.http.get(
+            ALPHA_VANTAGE_BASE_URL, params=params)
         response.raise_for_status()
 
-        data = response.json()
+        try:
+            data = response.json()
+        except ValueError as e:
+            raise HTTPException(
+                status_code=500, detail=f"Error searching stocks: {str(e)}")
 
         if "Error Message" in data:
             raise HTTPException(status_code=400, detail=data["Error Message"])
@@ -123,13 +212,13 @@ async def search_stocks(keywords: str):
 
         return data
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(
             status_code=500, detail=f"Error searching stocks: {str(e)}")
 
 
 @app.get("/plot/risk/{symbol}", response_class=HTMLResponse)
-async def plot_risk_analysis(symbol: str, target_selling_price: float, stop_loss: float, user_volume: float):
+async def plot_risk_analysis(symbol: str, target_selling_price: float, stop_loss: float, user_volume: float, format: Literal["html", "png"] = "html"):
     """
     Analyse risk for a given stock with target selling price and stop loss
 
@@ -138,6 +227,7 @@ async def plot_risk_analysis(symbol: str, target_selling_price: float, stop_loss
         target_selling_price: Target price to sell the stock
         stop_loss: Stop loss price to limit losses
         user_volume: Number of shares the user is buying
+        format: "html" for a Chart.js radar chart, "png" for a server-rendered image
     """
     if not ALPHA_VANTAGE_API_KEY:
         raise HTTPException(
@@ -147,24 +237,7 @@ async def plot_risk_analysis(symbol: str, target_selling_price: float, stop_loss
 
     try:
         # Get stock data first
-        params = {
-            "function": "TIME_SERIES_DAILY",
-            "symbol": symbol.upper(),
-            "apikey": ALPHA_VANTAGE_API_KEY
-        }
-
-        response = requests.get(ALPHA_VANTAGE_BASE_URL, params=params)
-        response.raise_for_status()
-
-        data = response.json()
-
-        # Check for API errors
-        if "Error Message" in data:
-            raise HTTPException(status_code=400, detail=data["Error Message"])
-
-        if "Note" in data:
-            raise HTTPException(
-                status_code=429, detail="API rate limit exceeded")
+        data = await _fetch(app.state.http, "TIME_SERIES_DAILY", symbol)
 
         # Perform risk analysis
         risk_analysis = analyse_risk(
@@ -180,6 +253,8 @@ async def plot_risk_analysis(symbol: str, target_selling_price: float, stop_loss
             </html>
             """
 
+        plot = await _plot_html(risk_analysis, format)
+
         # Create HTML response with the plot
         html_content = f"""
         <!DOCTYPE html>
@@ -191,6 +266,7 @@ async def plot_risk_analysis(symbol: str, target_selling_price: float, stop_loss
                 .container {{ max-width: 1200px; margin: 0 auto; }}
                 .plot {{ text-align: center; margin: 20px 0; }}
                 .plot img {{ max-width: 100%; height: auto; }}
+                .plot canvas {{ max-width: 600px; margin: 0 auto; }}
                 .data {{ background: #f5f5f5; padding: 20px; border-radius: 8px; margin: 20px 0; }}
                 .data h3 {{ margin-top: 0; }}
                 .data table {{ width: 100%; border-collapse: collapse; }}
@@ -230,7 +306,7 @@ async def plot_risk_analysis(symbol: str, target_selling_price: float, stop_loss
                 
                 <div class="plot">
                     <h3>Risk Profile Radar Chart</h3>
-                    <img src="data:image/png;base64,{risk_analysis['plot']}" alt="Risk Profile Chart">
+                    {plot}
                 </div>
             </div>
         </body>
@@ -239,7 +315,7 @@ async def plot_risk_analysis(symbol: str, target_selling_price: float, stop_loss
 
         return HTMLResponse(content=html_content)
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(
             status_code=500, detail=f"Error fetching data: {str(e)}")
 
@@ -251,7 +327,9 @@ async def plot_risk_reward_analysis(
     stop_loss: float,
     user_volume: float,
     holding_period_days: int = 30,
-    risk_free_rate: float = 0.04
+    risk_free_rate: float = 0.04,
+    n_simulations: int = Query(1000, ge=1, le=MAX_SIMULATIONS),
+    format: Literal["html", "png"] = "html"
 ):
     """
     Comprehensive risk/reward analysis for a given stock
@@ -263,6 +341,8 @@ async def plot_risk_reward_analysis(
         user_volume: Number of shares the user is buying
         holding_period_days: Investment horizon in days (default: 30)
         risk_free_rate: Annual risk-free rate (default: 0.04 = 4%)
+        n_simulations: Monte Carlo paths for the success probability (default: 1000, max: 1,000,000)
+        format: "html" for a Chart.js radar chart, "png" for a server-rendered image
     """
     if not ALPHA_VANTAGE_API_KEY:
         raise HTTPException(
@@ -272,28 +352,12 @@ async def plot_risk_reward_analysis(
 
     try:
         # Get stock data first
-        params = {
-            "function": "TIME_SERIES_DAILY",
-            "symbol": symbol.upper(),
-            "apikey": ALPHA_VANTAGE_API_KEY
-        }
-
-        response = requests.get(ALPHA_VANTAGE_BASE_URL, params=params)
-        response.raise_for_status()
-
-        data = response.json()
-
-        # Check for API errors
-        if "Error Message" in data:
-            raise HTTPException(status_code=400, detail=data["Error Message"])
-
-        if "Note" in data:
-            raise HTTPException(
-                status_code=429, detail="API rate limit exceeded")
+        data = await _fetch(app.state.http, "TIME_SERIES_DAILY", symbol)
 
         # Perform comprehensive risk/reward analysis
         analysis_result = calculate_risk_reward(
-            data, target_price, stop_loss, user_volume, holding_period_days, risk_free_rate
+            data, target_price, stop_loss, user_volume, holding_period_days, risk_free_rate,
+            n_simulations
         )
 
         if "error" in analysis_result:
@@ -306,6 +370,8 @@ async def plot_risk_reward_analysis(
             </html>
             """
 
+        plot = await _plot_html(analysis_result, format)
+
         # Create HTML response with the comprehensive analysis
         html_content = f"""
         <!DOCTYPE html>
@@ -317,6 +383,7 @@ async def plot_risk_reward_analysis(
                 .container {{ max-width: 1200px; margin: 0 auto; }}
                 .plot {{ text-align: center; margin: 20px 0; }}
                 .plot img {{ max-width: 100%; height: auto; }}
+                .plot canvas {{ max-width: 600px; margin: 0 auto; }}
                 .data {{ background: #f5f5f5; padding: 20px; border-radius: 8px; margin: 20px 0; }}
                 .data h3 {{ margin-top: 0; }}
                 .data table {{ width: 100%; border-collapse: collapse; }}
@@ -377,7 +444,7 @@ async def plot_risk_reward_analysis(
                 
                 <div class="plot">
                     <h3>Risk Profile Radar Chart</h3>
-                    <img src="data:image/png;base64,{analysis_result['plot']}" alt="Risk Profile Chart">
+                    {plot}
                 </div>
             </div>
         </body>
@@ -386,7 +453,7 @@ async def plot_risk_reward_analysis(
 
         return HTMLResponse(content=html_content)
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(
             status_code=500, detail=f"Error fetching data: {str(e)}")
 
@@ -0,0 +1,74 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Fused single-pass risk statistics over a float32 close series.
+
+Optional accelerator for ``_kernels.compute_all``. Build it in place with:
+
+    CFLAGS="-O3 -ffast-math -march=native" cythonize -i risk_kernel.pyx
+"""
+from libc.math cimport sqrt, NAN
+
+
+cpdef tuple compute_all(const float[::1] closes, int rsi_len=14):
+    """
+    Volatility, RSI bearish frequency and return statistics in one pass.
+
+    Returns:
+        Tuple of (volatility, bearish_freq, current, avg_ret, std_ret)
+    """
+    cdef Py_ssize_t n = closes.shape[0]
+    cdef Py_ssize_t i
+    cdef Py_ssize_t n_ret = 0
+    cdef Py_ssize_t n_rsi = 0
+    cdef Py_ssize_t bearish = 0
+    cdef double change, ret, gain, loss, rsi, delta_mean
+    cdef double mean = 0.0
+    cdef double m2 = 0.0
+    cdef double avg_gain = 0.0
+    cdef double avg_loss = 0.0
+    cdef double std_ret
+
+    if n == 0:
+        raise IndexError("closes is empty")
+
+    for i in range(1, n):
+        change = closes[i] - closes[i - 1]
+
+        # Welford update of the daily return mean and variance
+        ret = change / closes[i - 1]
+        n_ret += 1
+        delta_mean = ret - mean
+        mean += delta_mean / n_ret
+        m2 += delta_mean * (ret - mean)
+
+        # Wilder's smoothed gains and losses, seeded with a simple mean
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        if i <= rsi_len:
+            avg_gain += gain
+            avg_loss += loss
+            if i < rsi_len:
+                continue
+            avg_gain /= rsi_len
+            avg_loss /= rsi_len
+        else:
+            avg_gain = (avg_gain * (rsi_len - 1) + gain) / rsi_len
+            avg_loss = (avg_loss * (rsi_len - 1) + loss) / rsi_len
+
+        if avg_loss == 0:
+            rsi = 100.0
+        else:
+            rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        n_rsi += 1
+        if rsi < 30:
+            bearish += 1
+
+    std_ret = sqrt(m2 / (n_ret - 1)) if n_ret > 1 else NAN
+
+    return (
+        std_ret * sqrt(252.0),
+        bearish / <double>n_rsi if n_rsi else 0.0,
+        <double>closes[n - 1],
+        mean if n_ret else NAN,
+        std_ret
+    )